@@ -3,13 +3,15 @@ import os
 
 class BaseReader:
     @classmethod
-    def open(cls, filename):
+    def open(cls, filename, **kwargs):
         """ Returns a representation of the information in the given file.
 
         Parameters
         ----------
         filename : str
             A file to represent
+        **kwargs
+            Additional options passed on to the reader
 
         Returns
         -------
@@ -19,8 +21,23 @@ class BaseReader:
         if not os.path.exists(filename):
             raise FileNotFoundError("File «{0}» not found".format(filename))
 
-        reader = cls(filename)
+        reader = cls(filename, **kwargs)
         return reader
 
-    def __init__(self, filename):
-        self._filename = filename
\ No newline at end of file
+    def __init__(self, filename, **kwargs):
+        if len(kwargs) > 0:
+            raise TypeError("{0} does not support the options {1}".format(
+                self.__class__.__name__, ", ".join(sorted(kwargs))))
+
+        self._filename = filename
+
+    def _open(self, statistics=None, mode="r"):
+        """ Opens the represented file, instrumented if statistics are given. """
+        if statistics is None:
+            return open(self._filename, mode)
+        else:
+            return statistics.open(self._filename, mode)
+
+    def _parser(self, parse, statistics=None, count=None):
+        """ Returns parse, timed if statistics are given. """
+        return parse if statistics is None else statistics.timed(parse, count)
@@ -1,13 +1,144 @@
+from array import array
+from collections import Counter
+from itertools import islice
 from .BaseAlignedRead import BaseAlignedRead
 from .BaseReader import BaseReader
+from .ReaderProfiler import ReaderProfiler
+
+_strand_codes = {"+": 1, "-": -1, ".": 0}
+
 
 class BedtoolsIntersectionReader(BaseReader):
     """A reader for tabulated intersection files from bedtools
+
+    Besides iterating over BedtoolsIntersectionItem objects, the file can be read in chunks of
+    typed columns with columns(), which creates no object per row. Chromosomes and feature ids
+    are stored as integer codes into the chromosomes and feature_ids lists of the reader, which
+    are shared by all chunks.
     """
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.chromosomes = []
+        self.feature_ids = []
+        self._chromosome_codes = {}
+        self._feature_id_codes = {}
+
     def __iter__(self):
-        with open(self._filename) as fh:
+        statistics = ReaderProfiler.statistics_for(self)
+        from_line = self._parser(BedtoolsIntersectionItem.from_line, statistics)
+
+        with self._open(statistics) as fh:
             for line in fh:
-                yield BedtoolsIntersectionItem.from_line(line)
+                yield from_line(line)
+
+    def columns(self, chunk_size=100000):
+        """ Yields the intersection rows in chunks of typed columns.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Maximum number of rows per chunk.
+
+        Returns
+        -------
+        IntersectionColumns
+            The columns of up to chunk_size rows.
+        """
+        statistics = ReaderProfiler.statistics_for(self)
+        parse_chunk = self._parser(self._parse_chunk, statistics, len)
+
+        with self._open(statistics) as fh:
+            while True:
+                lines = list(islice(fh, chunk_size))
+                if len(lines) == 0:
+                    break
+
+                yield parse_chunk(lines)
+
+    def count_by_feature(self, chunk_size=100000):
+        """ Returns a Counter of the number of rows per feature id over the whole file. """
+        counts = Counter()
+        for chunk in self.columns(chunk_size):
+            counts.update(chunk.count_by_feature())
+        return counts
+
+    def _parse_chunk(self, lines):
+        chromosomes, starts, stops, qnames, strands, types, fstarts, fstops, fids = \
+            zip(*(line.rstrip("\r\n").split("\t", 8) for line in lines))
+
+        return IntersectionColumns(
+            self,
+            __class__._encode(chromosomes, self._chromosome_codes, self.chromosomes),
+            array("q", map(int, starts)),
+            array("q", map(int, stops)),
+            array("b", map(_strand_codes.__getitem__, strands)),
+            __class__._encode(fids, self._feature_id_codes, self.feature_ids),
+        )
+
+    @staticmethod
+    def _encode(values, codes, names):
+        """ Maps values to integer codes, adding unknown values to codes and names. """
+        # dict.fromkeys keeps the order of first occurrence, so codes do not depend on hashing.
+        for value in dict.fromkeys(values):
+            if value not in codes:
+                codes[value] = len(names)
+                names.append(value)
+
+        return array("I", map(codes.__getitem__, values))
+
+
+class IntersectionColumns:
+    """A chunk of bedtools intersection rows stored as typed columns.
+
+    Parameters
+    ----------
+    reader : BedtoolsIntersectionReader
+        The reader the chunk comes from, which resolves chromosome and feature id codes.
+    chromosome_codes : array
+        Index of the chromosome of each row in reader.chromosomes.
+    starts : array
+        Start position of each read, 0-based.
+    stops : array
+        Position after the last base of each read.
+    strands : array
+        1 for +, -1 for - and 0 for an unknown strand.
+    feature_id_codes : array
+        Index of the feature id of each row in reader.feature_ids.
+    """
+    def __init__(self, reader, chromosome_codes, starts, stops, strands, feature_id_codes):
+        self._reader = reader
+        self.chromosome_codes = chromosome_codes
+        self.starts = starts
+        self.stops = stops
+        self.strands = strands
+        self.feature_id_codes = feature_id_codes
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def lengths(self):
+        """ The length of each read. """
+        return array("q", map(int.__sub__, self.stops, self.starts))
+
+    def count_by_feature(self):
+        """ Returns a Counter of the number of rows per feature id. """
+        feature_ids = self._reader.feature_ids
+        return Counter({feature_ids[code]: count for code, count in Counter(self.feature_id_codes).items()})
+
+    def count_by_chromosome(self):
+        """ Returns a Counter of the number of rows per chromosome. """
+        chromosomes = self._reader.chromosomes
+        return Counter({chromosomes[code]: count for code, count in Counter(self.chromosome_codes).items()})
+
+    def bases_by_feature(self):
+        """ Returns a Counter of the summed read lengths per feature id. """
+        bases = [0] * len(self._reader.feature_ids)
+        for code, length in zip(self.feature_id_codes, self.lengths):
+            bases[code] += length
+
+        feature_ids = self._reader.feature_ids
+        return Counter({feature_ids[code]: total for code, total in enumerate(bases) if total > 0})
 
 
 class BedtoolsIntersectionItem(BaseAlignedRead):
@@ -1,6 +1,7 @@
 
 from .BaseAlignedRead import BaseAlignedRead
 from .BaseReader import BaseReader
+from .ReaderProfiler import ReaderProfiler
 
 
 class GenomFeatureReader(BaseReader):
@@ -8,12 +9,15 @@ class GenomFeatureReader(BaseReader):
 
     """
     def __iter__(self):
-        with open(self._filename) as fh:
+        statistics = ReaderProfiler.statistics_for(self)
+        from_line = self._parser(GenomFeatureItem.from_line, statistics)
+
+        with self._open(statistics) as fh:
             for line in fh:
                 if line.startswith("#"):
                     continue
 
-                yield GenomFeatureItem.from_line(line)
+                yield from_line(line)
 
     def __contains__(self, item):
         self.prepare()
@@ -31,6 +35,29 @@ class GenomFeatureReader(BaseReader):
         else:
             raise IndexError("{0} feature not found in .gff file".format(item))
 
+    def fetch(self, chromosome, start=0, stop=None):
+        """ Yields features on a chromosome which overlap the region start to stop.
+
+        The features are read once and kept per chromosome for later calls.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome identifier name.
+        start : int
+            First position of the region, 0-based.
+        stop : int
+            Position after the last base of the region. None means the end of the chromosome.
+        """
+        if "_chromosome_dict" not in self.__dict__:
+            self._chromosome_dict = {}
+            for feature in self:
+                self._chromosome_dict.setdefault(feature.chromosome, []).append(feature)
+
+        for feature in self._chromosome_dict.get(chromosome, []):
+            if feature.stop > start and (stop is None or feature.start < stop):
+                yield feature
+
     def prepare(self):
         if "_prepared" in self.__dict__:
             return None
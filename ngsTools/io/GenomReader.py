@@ -2,25 +2,62 @@
 Provides a reader genomic .fasta files
 """
 import os
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
 from .BaseReader import BaseReader
 from .BaseAlignedRead import BaseAlignedRead
+from .ReaderProfiler import ReaderProfiler
 from .SamReader import SamAlignedRead
 from ..utils import get_reverse_complement
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
 class GenomReader(BaseReader):
-    def __init__(self, filename):
-        super().__init__(filename)
+    """Represents the chromosomes stored in a .fasta file.
+
+    Decoded, uppercased blocks of block_size bases are kept in a least recently used cache, so
+    repeated lookups of nearby regions do not need to touch the file again.
+
+    Slices which reach past the end of a chromosome are clipped to its length, so
+    genom["chrI", 20:60] returns the bases from 20 to the end of chrI.
+
+    Parameters
+    ----------
+    filename : str
+        The .fasta file
+    cache_size : int
+        Maximum number of blocks kept in the cache. 0 disables the cache.
+    block_size : int
+        Number of bases per cached block.
+    """
+    def __init__(self, filename, cache_size=64, block_size=65536, **kwargs):
+        super().__init__(filename, **kwargs)
+
+        if cache_size < 0 or block_size <= 0:
+            raise TypeError("cache_size needs to be >= 0 and block_size > 0")
+
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._block_size = block_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._server = None
+
         self.prepare()
 
     def prepare(self):
         self._chromosomes = {}
+        self._offsets = {}
+        self._lengths = {}
         self._listOfChromosomes = []
+        self.cache_clear()
 
         lastChromosome = "(empty)"
         oldPos = -1
 
-        with open(self._filename, "r") as fh:
+        with self._open(ReaderProfiler.statistics_for(self)) as fh:
             while True:
                 pos = fh.tell()
                 line = fh.readline().strip()
@@ -32,13 +69,62 @@ class GenomReader(BaseReader):
                 if line.startswith(">"):
                     lastChromosome = line[1:].split(" ")[0]
                     self._chromosomes[lastChromosome] = []
+                    self._offsets[lastChromosome] = []
+                    self._lengths[lastChromosome] = 0
                     continue
 
                 if len(line) > 0:
                     self._chromosomes[lastChromosome].append((pos, len(line)))
+                    self._offsets[lastChromosome].append(self._lengths[lastChromosome])
+                    self._lengths[lastChromosome] += len(line)
 
         self._listOfChromosomes = self._chromosomes.keys()
 
+    @property
+    def chromosomes(self):
+        """ List of the chromosome identifier names, in file order. """
+        return list(self._listOfChromosomes)
+
+    def get_length(self, chromosome):
+        """ Returns the number of bases of a chromosome. """
+        return self._lengths[chromosome]
+
+    def cache_info(self):
+        """ Returns hits, misses, maximum and current size of the block cache. """
+        return CacheInfo(self._cache_hits, self._cache_misses, self._cache_size, len(self._cache))
+
+    def cache_clear(self):
+        """ Empties the block cache and resets its statistics. """
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    async def afetch(self, chromosome, start, stop, reverse=False):
+        """ Returns the bases start to stop of a chromosome without blocking the event loop.
+
+        Requests are served by a GenomRegionServer which is created on first use and shut
+        down by close(). See GenomRegionServer.fetch for the parameters.
+        """
+        if self._server is None:
+            # Imported here, since asyncio is only needed by afetch.
+            from .GenomRegionServer import GenomRegionServer
+            self._server = GenomRegionServer(self)
+
+        return await self._server.fetch(chromosome, start, stop, reverse)
+
+    def close(self):
+        """ Shuts down the GenomRegionServer used by afetch, if any. """
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def __getstate__(self):
+        # Neither the region server nor the cached blocks are sent to other processes.
+        state = self.__dict__.copy()
+        state["_server"] = None
+        state["_cache"] = OrderedDict()
+        return state
+
     def __contains__(self, item):
         if type(item) == SamAlignedRead:
             return True if item.isAligned and item.referenceName in self._listOfChromosomes else False
@@ -53,89 +139,135 @@ class GenomReader(BaseReader):
             if type(index[0]) != str:
                 raise TypeError("First index must be a string which references a chromosome")
 
-            chromosome = self._chromosomes[index[0]]
+            chromosome = index[0]
             listOfSlices = index[1:]
         else:
             if type(index) == str:
                 # only a chromosome string, do something else.
                 if index in self:
-                    length = 0
-                    for row in self._chromosomes[index]:
-                        length += row[1]
-                    return self[index,0:length]
+                    return self[index,0:self._lengths[index]]
                 else:
                     raise TypeError("Chromosome is not in this genom.")
             elif not isinstance(index, BaseAlignedRead):
                 raise TypeError("A ShortRead can only be used as the sole index")
 
-            chromosome = self._chromosomes[index.chromosome]
+            chromosome = index.chromosome
             listOfSlices = [index]
 
+        if chromosome not in self._chromosomes:
+            raise KeyError(chromosome)
+
         ret = []
-        fh = open(self._filename)
-
-        for slicePiece in listOfSlices:
-            if type(slicePiece) == int:
-                slicePiece = slice(slicePiece, slicePiece + 1)
-
-            length = slicePiece.stop - slicePiece.start
-            lengthLeft = length
-            chromosome_pos = - 1
-            sequence = ""
-            startFound = False
-            stopFound = False
-
-            for i in range(0, len(chromosome)):
-                seek, linelength = chromosome[i]
-                # add linelength to chromosome position
-                if chromosome_pos < 0:
-                    chromosome_pos = 0
+        fh = None
+
+        def handle():
+            nonlocal fh
+            if fh is None:
+                fh = self._open(ReaderProfiler.statistics_for(self))
+            return fh
+
+        try:
+            for slicePiece in listOfSlices:
+                if type(slicePiece) == int:
+                    slicePiece = slice(slicePiece, slicePiece + 1)
+
+                if slicePiece.start < 0:
+                    raise TypeError("Cannot read at starts < 0!")
+
+                if slicePiece.stop < slicePiece.start:
+                    raise TypeError("The stop of a slice needs to be >= its start.")
+
+                if slicePiece.start >= self._lengths[chromosome]:
+                    continue
+
+                if self._cache_size > 0:
+                    sequence = self._read_cached(chromosome, slicePiece.start, slicePiece.stop, handle)
                 else:
-                    chromosome_pos += chromosome[i-1][1]
-
-                # Search for start position first
-                if startFound == False:
-                    # skip if position is further away than current line
-                    if slicePiece.start >= (chromosome_pos + linelength):
-                        continue
-
-                    # now we should be on the correct line
-                    pos = slicePiece.start - chromosome_pos
-                    fh.seek(seek + pos)
-                    startFound = True
-
-                    if slicePiece.stop > (chromosome_pos + linelength):
-                        sequence += fh.readline().strip()
-                        lengthLeft -= len(sequence)
-                    else:
-                        sequence += fh.readline().strip()[0:length]
-                        lengthLeft -= len(sequence)
-                        stopFound = True
-                        break
-
-                if startFound == True and stopFound == False and lengthLeft > 0:
-                    if lengthLeft - linelength <= 0:
-                        # stop found
-                        line = fh.readline().strip()[0:lengthLeft]
-                        lengthLeft -= len(line)
-                        sequence += line
-                        stopFound = True
-                        break
-                    else:
-                        lengthLeft -= linelength
-                        sequence += fh.readline().strip()
-
-            if startFound and stopFound:
+                    sequence = self._read(chromosome, slicePiece.start, slicePiece.stop, handle()).upper()
+
                 if slicePiece.step == -1:
                     ret.append(get_reverse_complement(sequence).upper())
                 else:
-                    ret.append(sequence.upper())
-            elif startFound and not stopFound:
-                raise Exception("Out of Boundaries exception: ", slicePiece)
-
-        fh.close()
+                    ret.append(sequence)
+        finally:
+            if fh is not None:
+                fh.close()
 
         if len(ret) == 1:
             return ret[0]
         else:
-            return ret
\ No newline at end of file
+            return ret
+
+    def _read(self, chromosome, start, stop, fh):
+        """ Reads the bases start to stop of a chromosome from an open file, clipped to its length. """
+        stop = min(stop, self._lengths[chromosome])
+        if start >= stop:
+            return ""
+
+        lines = self._chromosomes[chromosome]
+        offsets = self._offsets[chromosome]
+        i = bisect_right(offsets, start) - 1
+
+        seek, linelength = lines[i]
+        fh.seek(seek + start - offsets[i])
+        sequence = []
+        lengthLeft = stop - start
+
+        while lengthLeft > 0:
+            line = fh.readline()
+            if len(line) == 0:
+                break
+
+            line = line.strip()[0:lengthLeft]
+            lengthLeft -= len(line)
+            sequence.append(line)
+
+        return "".join(sequence)
+
+    def _byte_range(self, chromosome, start, stop):
+        """ Returns the file offsets spanning the bases start to stop of a chromosome, clipped to its length. """
+        if start < 0:
+            raise TypeError("Cannot read at starts < 0!")
+
+        stop = min(stop, self._lengths[chromosome])
+        if start >= stop:
+            return 0, 0
+
+        lines = self._chromosomes[chromosome]
+        offsets = self._offsets[chromosome]
+        first = bisect_right(offsets, start) - 1
+        last = bisect_right(offsets, stop - 1) - 1
+
+        return lines[first][0] + start - offsets[first], lines[last][0] + stop - offsets[last]
+
+    def _read_cached(self, chromosome, start, stop, handle):
+        """ Assembles the bases start to stop of a chromosome from cached blocks. """
+        stop = min(stop, self._lengths[chromosome])
+        if start >= stop:
+            return ""
+
+        first = start // self._block_size
+        last = (stop - 1) // self._block_size
+        blocks = [self._get_block(chromosome, block, handle) for block in range(first, last + 1)]
+        offset = first * self._block_size
+
+        return "".join(blocks)[start - offset:stop - offset]
+
+    def _get_block(self, chromosome, block, handle):
+        """ Returns a decoded, uppercased block from the cache, reading it on a miss. """
+        key = (chromosome, block)
+
+        if key in self._cache:
+            self._cache_hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self._cache_misses += 1
+        start = block * self._block_size
+        sequence = self._read(chromosome, start, start + self._block_size, handle()).upper()
+
+        self._cache[key] = sequence
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return sequence
@@ -0,0 +1,177 @@
+"""
+Provides an asyncio frontend for concurrent region lookups on a GenomReader.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from ..utils import get_reverse_complement
+
+
+class GenomRegionServer:
+    """Serves regions of a GenomReader to concurrent asyncio tasks.
+
+    Regions are read with os.pread on a single shared file descriptor inside a thread pool, so
+    the event loop never blocks on I/O. Requests for the same chromosome which are queued during
+    the same event loop iteration are served as one batch; regions in a batch which lie close
+    together are read with a single pread, as long as they do not span more than max_span bases.
+
+    Parameters
+    ----------
+    genom : GenomReader
+        The genom to serve regions from.
+    max_workers : int
+        Number of threads in the pool. None lets the ThreadPoolExecutor decide.
+    max_gap : int
+        Regions of a batch which are at most max_gap bases apart are read together.
+    max_span : int
+        Regions are only read together as long as they span at most max_span bases. Larger
+        batches are split into several preads, which run in parallel in the pool.
+
+    Examples
+    --------
+
+    >>> genom = GenomReader.open("genom.fasta")
+    >>> async def main():
+    >>>     return await asyncio.gather(genom.afetch("chrI", 0, 10), genom.afetch("chrI", 20, 30))
+    >>> asyncio.run(main())
+    """
+    def __init__(self, genom, max_workers=None, max_gap=65536, max_span=1048576):
+        self._genom = genom
+        self._max_gap = max_gap
+        self._max_span = max_span
+        self._fd = os.open(genom._filename, os.O_RDONLY)
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._pending = {}
+        self.batches = 0
+        self.preads = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """ Shuts down the thread pool and closes the shared file descriptor. """
+        if self._fd is None:
+            return None
+
+        self._executor.shutdown(wait=True)
+        os.close(self._fd)
+        self._fd = None
+
+    async def fetch(self, chromosome, start, stop, reverse=False):
+        """ Returns the uppercased bases start to stop of a chromosome.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome identifier name.
+        start : int
+            First base of the region, 0-based.
+        stop : int
+            Position after the last base of the region.
+        reverse : bool
+            If True, the reverse complement of the region is returned.
+
+        Returns
+        -------
+        str
+            The sequence of the region, clipped to the end of the chromosome.
+        """
+        if self._fd is None:
+            raise ValueError("GenomRegionServer is closed")
+
+        if chromosome not in self._genom:
+            raise KeyError(chromosome)
+
+        if start < 0:
+            raise TypeError("Cannot read at starts < 0!")
+
+        if stop < start:
+            raise TypeError("The stop of a region needs to be >= its start.")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if chromosome not in self._pending:
+            self._pending[chromosome] = []
+            loop.call_soon(self._dispatch, loop, chromosome)
+
+        self._pending[chromosome].append((start, stop, future))
+        sequence = await future
+
+        return get_reverse_complement(sequence) if reverse else sequence
+
+    def _dispatch(self, loop, chromosome):
+        """ Hands all queued requests of a chromosome to the thread pool, one task per group. """
+        batch = self._pending.pop(chromosome)
+        self.batches += 1
+
+        for group in self._group([(start, stop) for start, stop, future in batch]):
+            regions = [batch[i][0:2] for i in group]
+            futures = [batch[i][2] for i in group]
+            task = loop.run_in_executor(self._executor, self._read_group, chromosome, regions)
+            task.add_done_callback(lambda result, futures=futures: self._resolve(result, futures))
+
+    @staticmethod
+    def _resolve(result, futures):
+        """ Passes the sequences or the exception of a finished group on to the waiting requests. """
+        if result.exception() is not None:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(result.exception())
+            return None
+
+        for future, sequence in zip(futures, result.result()):
+            if not future.done():
+                future.set_result(sequence)
+
+    def _group(self, regions):
+        """ Splits regions into groups which can be read with a single pread.
+
+        A region joins the current group if it starts at most max_gap bases after the group
+        ends and the group does not grow beyond max_span bases by it.
+
+        Returns
+        -------
+        list
+            A list of groups, each a list of indices into regions.
+        """
+        groups = []
+        group_start = group_stop = None
+
+        for i in sorted(range(len(regions)), key=lambda i: regions[i][0]):
+            start, stop = regions[i]
+
+            if group_stop is not None and start <= group_stop + self._max_gap \
+                    and max(group_stop, stop) - group_start <= self._max_span:
+                groups[-1].append(i)
+                group_stop = max(group_stop, stop)
+            else:
+                groups.append([i])
+                group_start, group_stop = start, stop
+
+        return groups
+
+    def _read_group(self, chromosome, regions):
+        """ Reads a group of regions with a single pread. """
+        group_start = min(start for start, stop in regions)
+        group_stop = max(stop for start, stop in regions)
+        sequence = self._pread(chromosome, group_start, group_stop)
+
+        return [sequence[start - group_start:stop - group_start] for start, stop in regions]
+
+    def _pread(self, chromosome, start, stop):
+        """ Reads the bases start to stop of a chromosome with a single pread. """
+        begin, end = self._genom._byte_range(chromosome, start, stop)
+        data = b""
+
+        while len(data) < end - begin:
+            chunk = os.pread(self._fd, end - begin - len(data), begin + len(data))
+            if len(chunk) == 0:
+                break
+            data += chunk
+
+        self.preads += 1
+        return data.translate(None, b" \t\r\n").decode("ascii").upper()
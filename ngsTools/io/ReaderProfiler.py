@@ -0,0 +1,197 @@
+"""
+Provides opt-in instrumentation for the readers of ngsTools.io.
+
+Readers ask for a ReaderStatistics object once per pass over their file. If no ReaderProfiler
+is active they get None and run their usual, uninstrumented code path.
+"""
+import time
+
+
+class ReaderStatistics:
+    """Counters collected for a single reader.
+
+    Parameters
+    ----------
+    name : str
+        The name of the reader class.
+    filename : str
+        The file the reader represents.
+    """
+    def __init__(self, name, filename):
+        self.name = name
+        self.filename = filename
+        self.lines = 0
+        self.bytes = 0
+        self.records = 0
+        self.opens = 0
+        self.seeks = 0
+        self.io_time = 0.0
+        self.parse_time = 0.0
+
+    @property
+    def records_per_second(self):
+        """ Number of records produced per second spent in I/O and parsing. """
+        total = self.io_time + self.parse_time
+        return self.records / total if total > 0 else 0.0
+
+    def open(self, filename, mode="r"):
+        """ Opens a file and returns a file object which counts lines, bytes and seeks. """
+        start = time.perf_counter()
+        # Text files are opened without newline translation, so the proxy sees the line endings
+        # as stored in the file and translates them itself.
+        fh = open(filename, mode) if "b" in mode else open(filename, mode, newline="")
+        self.io_time += time.perf_counter() - start
+        self.opens += 1
+        return _ProfiledFile(fh, self)
+
+    def timed(self, parse, count=None):
+        """ Wraps a parse function, counting the records it returns and the time it takes.
+
+        If count is given, it gets called with each return value of parse and returns the
+        number of records it holds. Otherwise, every return value is one record.
+        """
+        def timed_parse(*args):
+            start = time.perf_counter()
+            record = parse(*args)
+            self.parse_time += time.perf_counter() - start
+            self.records += 1 if count is None else count(record)
+            return record
+
+        return timed_parse
+
+    def __repr__(self):
+        return ("<ReaderStatistics {0} «{1}»: {2} lines, {3} bytes, {4} records, {5} opens, {6} seeks, "
+                "io {7:.6f}s, parsing {8:.6f}s>").format(self.name, self.filename, self.lines, self.bytes,
+                                                         self.records, self.opens, self.seeks, self.io_time,
+                                                         self.parse_time)
+
+
+class _ProfiledFile:
+    """A thin proxy around a file object which reports to a ReaderStatistics object."""
+    def __init__(self, fh, statistics):
+        self._fh = fh
+        self._statistics = statistics
+        self._encoding = getattr(fh, "encoding", None)
+
+    def _count(self, line):
+        """ Counts line with the bytes it takes up in the file and returns it as text mode would. """
+        self._statistics.lines += 1
+
+        if self._encoding is None:
+            self._statistics.bytes += len(line)
+            return line
+
+        self._statistics.bytes += len(line.encode(self._encoding))
+
+        # Translate \r\n and \r line endings to \n, like the default text mode does.
+        if line.endswith("\r\n"):
+            return line[:-2] + "\n"
+        elif line.endswith("\r"):
+            return line[:-1] + "\n"
+        else:
+            return line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            line = next(self._fh)
+        finally:
+            self._statistics.io_time += time.perf_counter() - start
+
+        return self._count(line)
+
+    def readline(self):
+        start = time.perf_counter()
+        line = self._fh.readline()
+        self._statistics.io_time += time.perf_counter() - start
+
+        return self._count(line) if len(line) > 0 else line
+
+    def seek(self, offset, whence=0):
+        self._statistics.seeks += 1
+        return self._fh.seek(offset, whence)
+
+    def tell(self):
+        return self._fh.tell()
+
+    def close(self):
+        self._fh.close()
+
+
+class ReaderProfiler:
+    """Collects per-reader statistics while active.
+
+    A profiler is active inside its with-block. Only the innermost active profiler records.
+    Callbacks are called with the profiler once the with-block is left.
+
+    Parameters
+    ----------
+    callbacks : list
+        Functions which get called with the profiler when it gets deactivated.
+
+    Examples
+    --------
+
+    >>> with ReaderProfiler() as profiler:
+    >>>     for read in SamReader.open("file.sam"):
+    >>>         pass
+    >>> for statistics in profiler:
+    >>>     print(statistics.name, statistics.records_per_second)
+    """
+    _active = []
+    _callbacks = []
+
+    @classmethod
+    def register_callback(cls, callback):
+        """ Registers a callback which gets called with every profiler that gets deactivated. """
+        cls._callbacks.append(callback)
+
+    @classmethod
+    def unregister_callback(cls, callback):
+        """ Removes a callback previously added with register_callback. """
+        cls._callbacks.remove(callback)
+
+    @classmethod
+    def statistics_for(cls, reader):
+        """ Returns the ReaderStatistics of reader in the active profiler, or None if none is active. """
+        if len(cls._active) == 0:
+            return None
+
+        return cls._active[-1][reader]
+
+    def __init__(self, callbacks=None):
+        self._statistics = {}
+        self._own_callbacks = list(callbacks) if callbacks is not None else []
+
+    def __enter__(self):
+        __class__._active.append(self)
+        return self
+
+    def __exit__(self, *args):
+        __class__._active.remove(self)
+
+        for callback in self._own_callbacks + __class__._callbacks:
+            callback(self)
+
+    def __getitem__(self, reader):
+        key = (reader.__class__.__name__, reader._filename)
+
+        if key not in self._statistics:
+            self._statistics[key] = ReaderStatistics(*key)
+
+        return self._statistics[key]
+
+    def __iter__(self):
+        return iter(self._statistics.values())
+
+    def __len__(self):
+        return len(self._statistics)
@@ -4,8 +4,16 @@ Provides a reader for .sam stored Sequencing AlignMents.
 .sam files use 1-based coordinates.
 """
 import os
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
 from .BaseAlignedRead import BaseAlignedRead
 from .BaseReader import BaseReader
+from .ReaderProfiler import ReaderProfiler
+from ..utils import decode_qualities
+
+# A run of consecutive reads of one reference in a .sam file. positions and offsets hold the
+# position and byte offset of every checkpoint read, or are None if the run is not sorted.
+IndexRun = namedtuple("IndexRun", ["begin", "end", "positions", "offsets", "max_length"])
 
 
 class SamReader(BaseReader):
@@ -19,16 +27,23 @@ class SamReader(BaseReader):
     >>>     print("A read in the sam file ", read.sequence)
     >>> for read in sam.aligned:
     """
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._index = None
+
     def __iter__(self):
         """ Yields all reads, whether aligned or not. """
-        with open(self._filename, "r") as fh:
+        statistics = ReaderProfiler.statistics_for(self)
+        from_line = self._parser(SamAlignedRead.from_line, statistics)
+
+        with self._open(statistics) as fh:
             for line in fh:
                 if line.startswith("@"):
                     # @ are additional information
                     # ToDo: Add this information later!
                     continue
 
-                read = SamAlignedRead.from_line(line)
+                read = from_line(line)
                 yield read
 
     @property
@@ -40,6 +55,136 @@ class SamReader(BaseReader):
             else:
                 yield read
 
+    @property
+    def indexed(self):
+        """ True if index() has been called. """
+        return self._index is not None
+
+    def index(self, checkpoint_interval=1024):
+        """ Builds an in-memory index of the byte ranges which hold the reads of each reference.
+
+        A reference gets one IndexRun for every run of consecutive reads assigned to it, so a
+        coordinate sorted file has a single run per reference. Runs whose reads are sorted by
+        position get a checkpoint every checkpoint_interval reads, which lets fetch() start
+        reading close to the beginning of a region and stop after its end.
+
+        Parameters
+        ----------
+        checkpoint_interval : int
+            Number of reads between two checkpoints.
+
+        Returns
+        -------
+        dict
+            A dictionary mapping reference names to lists of IndexRun.
+        """
+        index = {}
+        run = None
+        offset = 0
+
+        with self._open(ReaderProfiler.statistics_for(self), "rb") as fh:
+            for line in fh:
+                if not line.startswith(b"@"):
+                    columns = line.split(b"\t", 10)
+                    reference = columns[2].decode()
+                    position = int(columns[3]) - 1
+
+                    if run is None or reference != run["reference"]:
+                        run = {"reference": reference, "begin": offset, "positions": [], "offsets": [],
+                               "max_length": 0, "sorted": True, "reads": 0, "last": None}
+                        index.setdefault(reference, []).append(run)
+
+                    if run["reads"] > 0 and position < run["last"]:
+                        run["sorted"] = False
+                    elif run["reads"] % checkpoint_interval == 0:
+                        run["positions"].append(position)
+                        run["offsets"].append(offset)
+
+                    run["reads"] += 1
+                    run["last"] = position
+                    run["max_length"] = max(run["max_length"], len(columns[9]))
+                    run["end"] = offset + len(line)
+
+                offset += len(line)
+
+        self._index = {
+            reference: [IndexRun(run["begin"], run["end"], run["positions"] if run["sorted"] else None,
+                                 run["offsets"] if run["sorted"] else None, run["max_length"]) for run in runs]
+            for reference, runs in index.items()
+        }
+        return self._index
+
+    def indexed_size(self, reference, start=0, stop=None):
+        """ Returns the number of bytes fetch() reads for a region, or None if not indexed. """
+        if self._index is None:
+            return None
+
+        size = 0
+
+        for run in self._index.get(reference, []):
+            if run.positions is None:
+                size += run.end - run.begin
+            else:
+                first = bisect_left(run.positions, start)
+                last = bisect_left(run.positions, stop) if stop is not None else len(run.positions)
+                size += (run.offsets[last] if last < len(run.offsets) else run.end) - \
+                        (run.offsets[first] if first < len(run.offsets) else run.end)
+
+        return size
+
+    def fetch(self, reference, start=0, stop=None):
+        """ Yields aligned reads on a reference which overlap the region start to stop.
+
+        Uses the index if one has been built, otherwise the whole file is read. For sorted runs
+        of the index, only the part of the file around the region is read.
+
+        Parameters
+        ----------
+        reference : str
+            The reference name, typically the chromosome.
+        start : int
+            First position of the region, 0-based.
+        stop : int
+            Position after the last base of the region. None means the end of the reference.
+        """
+        if self._index is None:
+            reads = self.aligned
+        else:
+            reads = self._fetch_indexed(reference, start, stop)
+
+        for read in reads:
+            if read.referenceName != reference or not read.isAligned:
+                continue
+
+            if read.stop > start and (stop is None or read.start < stop):
+                yield read
+
+    def _fetch_indexed(self, reference, start, stop):
+        """ Yields the reads of the index runs of a reference which may overlap start to stop. """
+        statistics = ReaderProfiler.statistics_for(self)
+        from_line = self._parser(SamAlignedRead.from_line, statistics)
+
+        with self._open(statistics, "rb") as fh:
+            for run in self._index.get(reference, []):
+                begin = run.begin
+                if run.positions is not None:
+                    # Reads before this checkpoint end before start.
+                    checkpoint = bisect_right(run.positions, start - run.max_length) - 1
+                    begin = run.offsets[max(checkpoint, 0)]
+
+                fh.seek(begin)
+                offset = begin
+
+                while offset < run.end:
+                    line = fh.readline()
+                    offset += len(line)
+                    read = from_line(line.decode())
+
+                    if run.positions is not None and stop is not None and read.start >= stop:
+                        break
+
+                    yield read
+
 
 class SamAlignedRead(BaseAlignedRead):
     """An aligned read from a SAM file.
@@ -83,7 +228,7 @@ class SamAlignedRead(BaseAlignedRead):
     @classmethod
     def from_line(cls, line):
         """ Creates a SamAlignedRead object by parsing a SAM line. """
-        return cls(*line.split("\t"))
+        return cls(*line.rstrip("\r\n").split("\t"))
 
     def __init__(self, qname, flag, rname, pos, mapq, cigar, rnext, pnext, tlen, seq, qual, *kwarg):
         self._qname = None if qname == "*" else qname
@@ -109,6 +254,29 @@ class SamAlignedRead(BaseAlignedRead):
     def referenceName(self):
         return self._rname
 
+    @property
+    def flag(self):
+        return self._flag
+
+    @property
+    def mappingQuality(self):
+        return self._mapq
+
+    @property
+    def storedSequence(self):
+        """ The uppercased sequence as stored in the file, not reverse complemented. None if not available. """
+        return None if self._seq == "*" else self._seq
+
+    @property
+    def qualityString(self):
+        """ The quality string as stored in the file, phred+33 encoded. None if not available. """
+        return None if self._qual == "*" else self._qual
+
+    @property
+    def qualities(self):
+        """ The phred quality of each base in file order as bytes, None if not available. """
+        return None if self._qual == "*" else decode_qualities([self._qual])[0]
+
     @property
     def length(self):
         return len(self._seq)
@@ -1,25 +1,105 @@
 """Subpackage for handling import and export of sequencing data.
 
+The reader modules are imported lazily: a public name gets imported on first access, and
+read() only imports the reader registered for the extension of the file.
 """
 
+import importlib
 import os
+import sys
+import types
 
-from .GenomFeatureReader import GenomFeatureReader
-from .GenomReader import GenomReader
-from .SamReader import SamReader, SamAlignedRead
-from .BaseAlignedRead import BaseAlignedRead
-from .BedtoolsIntersectionReader import BedtoolsIntersectionReader, BedtoolsIntersectionItem
+# Public names of this subpackage and the modules which define them.
+_lazy_names = {
+    "BaseAlignedRead": ".BaseAlignedRead",
+    "BedtoolsIntersectionItem": ".BedtoolsIntersectionReader",
+    "BedtoolsIntersectionReader": ".BedtoolsIntersectionReader",
+    "GenomFeatureReader": ".GenomFeatureReader",
+    "GenomReader": ".GenomReader",
+    "GenomRegionServer": ".GenomRegionServer",
+    "IntersectionColumns": ".BedtoolsIntersectionReader",
+    "ReaderProfiler": ".ReaderProfiler",
+    "ReaderStatistics": ".ReaderProfiler",
+    "SamAlignedRead": ".SamReader",
+    "SamReader": ".SamReader",
+}
+
+__all__ = sorted(_lazy_names) + ["read", "register_reader"]
 
 _extension_to_reader = {
-    "sam": SamReader.open,
-    "fasta": GenomReader.open,
-    "fa": GenomReader.open,
-    "fna": GenomReader.open,
-    "gff": GenomFeatureReader.open
+    "sam": ".SamReader:SamReader",
+    "fasta": ".GenomReader:GenomReader",
+    "fa": ".GenomReader:GenomReader",
+    "fna": ".GenomReader:GenomReader",
+    "gff": ".GenomFeatureReader:GenomFeatureReader"
 }
 
 
-def read(filename):
+class _LazyModule(types.ModuleType):
+    """The type of this package, which keeps reader modules from hiding the classes they define.
+
+    Importing a submodule binds it as an attribute of its package, for example when GenomReader
+    imports SamReader. The reader modules are named after their classes, so these bindings are
+    ignored, and __getattr__ resolves the class instead.
+    """
+    def __setattr__(self, name, value):
+        if name in _lazy_names and isinstance(value, types.ModuleType):
+            return None
+
+        super().__setattr__(name, value)
+
+
+def _import(module_name):
+    return importlib.import_module(module_name, __name__)
+
+
+def __getattr__(name):
+    if name in _lazy_names:
+        value = getattr(_import(_lazy_names[name]), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError("module «{0}» has no attribute «{1}»".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
+
+
+def register_reader(extension, reader):
+    """Registers a reader for a file extension, to be used by read().
+
+    Parameters
+    ----------
+    extension : str
+        The file extension, without the leading dot.
+    reader : str, type or callable
+        A reader class with an open classmethod, or a callable taking the filename and keyword
+        options. A string of the form "package.module:Reader" gets imported on first use, which
+        keeps plug-ins from slowing down the import of ngsTools.io.
+
+    Examples
+    --------
+
+    >>> register_reader("bed", "mypackage.BedReader:BedReader")
+    >>> reader = read("regions.bed")
+    """
+    _extension_to_reader[extension] = reader
+
+
+def _resolve(reader):
+    """Turns a registered reader into a callable taking the filename and keyword options."""
+    if isinstance(reader, str):
+        module_name, _, attribute = reader.partition(":")
+        reader = getattr(_import(module_name), attribute)
+
+    if isinstance(reader, type) and hasattr(reader, "open"):
+        return reader.open
+    else:
+        return reader
+
+
+def read(filename, **kwargs):
     """Tries to read a given filename.
 
     This function guesses the filetype based in the filename and returns
@@ -29,6 +109,8 @@ def read(filename):
     ----------
     filename : str
         The filename of the file to open.
+    **kwargs
+        Additional options passed on to the reader, like the cache_size of a GenomReader.
 
     Returns
     -------
@@ -37,11 +119,13 @@ def read(filename):
 
     Supported file formats
     ----------------------
-    A list of files supported by this function.
+    A list of files supported by this function. More can be added with register_reader.
 
         .sam      Sequence Alignment/Map     ngsTools.io.SamReader
         .fa
+        .fna
         .fasta    FASTA file format          ngsTools.io.GenomReader
+        .gff      General Feature Format     ngsTools.io.GenomFeatureReader
     """
     basename = os.path.basename(filename)
     extension = basename.split(".")[-1]
@@ -49,4 +133,7 @@ def read(filename):
     if extension not in _extension_to_reader:
         raise TypeError("ngsTools.io does not support this file extension «" + extension + "»")
 
-    return _extension_to_reader[extension](filename)
+    return _resolve(_extension_to_reader[extension])(filename, **kwargs)
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -0,0 +1,130 @@
+"""Subpackage for splitting whole-genome work into independent shards.
+
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+Shard = namedtuple("Shard", ["chromosome", "start", "stop", "size"])
+
+# Readers of the current worker process, set by _initialize_worker.
+_worker_readers = None
+
+
+def _initialize_worker(reads, features, genom):
+    global _worker_readers
+    _worker_readers = (reads, features, genom)
+
+
+def _run_shard(function, shard):
+    """Runs function over the reads, features and reference of one shard in a worker."""
+    reads, features, genom = _worker_readers
+
+    shard_reads = reads.fetch(shard.chromosome, shard.start, shard.stop) if reads is not None else iter(())
+    shard_features = list(features.fetch(shard.chromosome, shard.start, shard.stop)) if features is not None else []
+
+    return function(shard, shard_reads, shard_features, genom)
+
+
+class ShardScheduler:
+    """Splits a job into per-chromosome or per-region shards and runs them in a process pool.
+
+    The shards are taken from the chromosomes of a GenomReader. If reads are given, they get
+    indexed once, so that every shard only reads its own part of the .sam file. Reads of a
+    chromosome which are not sorted by position are read whole by each of its region shards.
+    The size of a shard is the number of bytes it reads from the .sam file, or its number of
+    bases without reads. Shards are submitted largest first, which keeps the workers evenly busy.
+
+    Parameters
+    ----------
+    genom : GenomReader
+        The reference, which defines the chromosomes.
+    reads : SamReader
+        Reads to hand to each shard, or None.
+    features : GenomFeatureReader
+        Features to hand to each shard, or None.
+    region_size : int
+        If given, chromosomes are split into regions of at most region_size bases.
+    processes : int
+        Number of worker processes. 1 runs all shards in the current process.
+
+    Examples
+    --------
+
+    >>> def count(shard, reads, features, reference):
+    >>>     return sum(1 for read in reads)
+    >>> scheduler = ShardScheduler(GenomReader.open("genom.fasta"), reads=SamReader.open("file.sam"))
+    >>> total = scheduler.run(count, combine=operator.add)
+    """
+    def __init__(self, genom, reads=None, features=None, region_size=None, processes=None):
+        if region_size is not None and region_size <= 0:
+            raise TypeError("region_size needs to be > 0")
+
+        self._genom = genom
+        self._reads = reads
+        self._features = features
+        self._region_size = region_size
+        self._processes = processes
+
+    def shards(self):
+        """ Returns the list of shards, in genom order. """
+        if self._reads is not None and not self._reads.indexed:
+            self._reads.index()
+
+        shards = []
+
+        for chromosome in self._genom.chromosomes:
+            length = self._genom.get_length(chromosome)
+            region_size = self._region_size if self._region_size is not None else max(length, 1)
+            for start in range(0, max(length, 1), region_size):
+                stop = min(start + region_size, length)
+
+                if self._reads is None:
+                    size = stop - start
+                else:
+                    size = self._reads.indexed_size(chromosome, start, stop)
+
+                shards.append(Shard(chromosome, start, stop, size))
+
+        return shards
+
+    def run(self, function, combine=None):
+        """ Runs function over every shard.
+
+        Parameters
+        ----------
+        function : callable
+            Gets called as function(shard, reads, features, reference) with an iterator over the
+            aligned reads overlapping the shard, a list of the features overlapping the shard and
+            the GenomReader. Reads and features crossing a region border are handed to both
+            shards. Must be picklable, i.e. defined at module level, unless processes is 1.
+        combine : callable
+            Combines two shard results into one. If None, the results are not combined.
+
+        Returns
+        -------
+        dict or object
+            A dictionary mapping shards to their results in genom order, or the combined result.
+        """
+        shards = self.shards()
+        order = sorted(shards, key=lambda shard: shard.size, reverse=True)
+
+        if self._processes == 1:
+            _initialize_worker(self._reads, self._features, self._genom)
+            try:
+                results = {shard: _run_shard(function, shard) for shard in order}
+            finally:
+                _initialize_worker(None, None, None)
+        else:
+            with ProcessPoolExecutor(self._processes, initializer=_initialize_worker,
+                                     initargs=(self._reads, self._features, self._genom)) as executor:
+                futures = {shard: executor.submit(_run_shard, function, shard) for shard in order}
+                results = {shard: futures[shard].result() for shard in order}
+
+        results = {shard: results[shard] for shard in shards}
+
+        if combine is None:
+            return results
+        else:
+            return reduce(combine, results.values())
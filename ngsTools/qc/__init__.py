@@ -0,0 +1,158 @@
+"""Subpackage for quality control statistics of sequencing reads.
+
+"""
+
+from collections import Counter
+from itertools import islice, zip_longest
+
+from ..utils import decode_qualities
+
+
+class QualityStatistics:
+    """Streaming quality control statistics over a set of reads.
+
+    The statistics get updated in chunks of reads. Qualities of a chunk are decoded with a
+    single translation and counted per cycle column by column, and base counts are taken over
+    the joined sequences of the chunk, so the work per read in Python is kept small.
+
+    Statistics collected on parts of a file, for example by several worker processes, can be
+    merged with merge() or the + operator.
+
+    Attributes
+    ----------
+    reads : int
+        Number of reads seen.
+    per_cycle : list
+        A Counter of phred qualities for each cycle. Qualities of reverse complemented reads
+        are reversed, so cycles are counted in sequencing order.
+    base_counts : Counter
+        Number of occurrences of each base.
+    gc_histogram : Counter
+        Number of reads per GC content, in percent.
+    mapq_histogram : Counter
+        Number of reads per mapping quality.
+    flag_histogram : Counter
+        Number of reads per flag.
+
+    Examples
+    --------
+
+    >>> statistics = QualityStatistics.collect(SamReader.open("file.sam"))
+    >>> print(statistics.gc_content, statistics.per_cycle_mean())
+    """
+    @classmethod
+    def collect(cls, reads, chunk_size=100000):
+        """ Collects the statistics of all reads, for example a SamReader, in chunks of chunk_size. """
+        statistics = cls()
+        reads = iter(reads)
+
+        while True:
+            chunk = list(islice(reads, chunk_size))
+            if len(chunk) == 0:
+                break
+
+            statistics.update(chunk)
+
+        return statistics
+
+    def __init__(self):
+        self.reads = 0
+        self.per_cycle = []
+        self.base_counts = Counter()
+        self.gc_histogram = Counter()
+        self.mapq_histogram = Counter()
+        self.flag_histogram = Counter()
+
+    def update(self, reads):
+        """ Adds a chunk of SamAlignedRead objects to the statistics. """
+        reads = list(reads)
+
+        qualities = [read.qualityString[::-1] if read.isReverseComplemented else read.qualityString
+                     for read in reads if read.qualityString is not None]
+
+        for cycle, column in enumerate(zip_longest(*decode_qualities(qualities))):
+            if cycle == len(self.per_cycle):
+                self.per_cycle.append(Counter())
+
+            self.per_cycle[cycle].update(column)
+            self.per_cycle[cycle].pop(None, None)
+
+        sequences = [read.storedSequence for read in reads if read.storedSequence is not None]
+        self.base_counts.update("".join(sequences))
+
+        for sequence in sequences:
+            if len(sequence) > 0:
+                self.gc_histogram[(sequence.count("G") + sequence.count("C")) * 100 // len(sequence)] += 1
+
+        self.mapq_histogram.update(read.mappingQuality for read in reads)
+        self.flag_histogram.update(read.flag for read in reads)
+        self.reads += len(reads)
+
+    def merge(self, other):
+        """ Adds the statistics of other to this one and returns it. """
+        for cycle, counts in enumerate(other.per_cycle):
+            if cycle == len(self.per_cycle):
+                self.per_cycle.append(Counter())
+
+            self.per_cycle[cycle].update(counts)
+
+        self.base_counts.update(other.base_counts)
+        self.gc_histogram.update(other.gc_histogram)
+        self.mapq_histogram.update(other.mapq_histogram)
+        self.flag_histogram.update(other.flag_histogram)
+        self.reads += other.reads
+
+        return self
+
+    def __add__(self, other):
+        return __class__().merge(self).merge(other)
+
+    @property
+    def bases(self):
+        """ Number of bases seen. """
+        return sum(self.base_counts.values())
+
+    @property
+    def gc_content(self):
+        """ Fraction of G and C among all bases. """
+        return (self.base_counts["G"] + self.base_counts["C"]) / self.bases if self.bases > 0 else 0.0
+
+    @property
+    def n_rate(self):
+        """ Fraction of N among all bases. """
+        return self.base_counts["N"] / self.bases if self.bases > 0 else 0.0
+
+    def per_cycle_mean(self):
+        """ Returns the mean phred quality of each cycle. """
+        return [sum(quality * count for quality, count in counts.items()) / sum(counts.values())
+                for counts in self.per_cycle]
+
+    def per_cycle_quantile(self, fraction):
+        """ Returns the phred quality below which the given fraction of bases lie, for each cycle.
+
+        Parameters
+        ----------
+        fraction : float
+            A number between 0 and 1; 0.5 gives the median.
+
+        Returns
+        -------
+        list
+            The quantile of each cycle.
+        """
+        if fraction < 0 or fraction > 1:
+            raise TypeError("fraction needs to be between 0 and 1")
+
+        ret = []
+
+        for counts in self.per_cycle:
+            threshold = fraction * sum(counts.values())
+            seen = 0
+
+            for quality in sorted(counts):
+                seen += counts[quality]
+                if seen >= threshold:
+                    ret.append(quality)
+                    break
+
+        return ret
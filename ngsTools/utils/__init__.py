@@ -20,6 +20,9 @@ _nucleotide_complement_map = {
     "B": "V"
 }
 
+# Translation table from phred+33 characters to phred qualities.
+_phred33_table = bytes(max(i - 33, 0) for i in range(256))
+
 
 def get_reverse_complement(sequence):
     """Returns the reverse complement of a given sequence.
@@ -52,3 +55,38 @@ def get_reverse_complement(sequence):
         revCompl += _nucleotide_complement_map[nucleotide.upper()]
 
     return revCompl
+
+
+def decode_qualities(qualities):
+    """Decodes phred+33 quality strings to phred qualities.
+
+    All strings are decoded with a single translation, which is much faster than
+    decoding each base on its own.
+
+    Parameters
+    ----------
+    qualities : list
+        A list of phred+33 encoded quality strings.
+
+    Returns
+    -------
+    list
+        A list of bytes objects, holding the phred quality of each base as an unsigned 8 bit integer.
+
+    Examples
+    --------
+
+    >>> decode_qualities(["II#", "5"])
+    [b'((\\x02', b'\\x14']
+    >>> list(decode_qualities(["II#"])[0])
+    [40, 40, 2]
+    """
+    decoded = "".join(qualities).encode("ascii").translate(_phred33_table)
+    ret = []
+    offset = 0
+
+    for quality in qualities:
+        ret.append(decoded[offset:offset + len(quality)])
+        offset += len(quality)
+
+    return ret
@@ -1,3 +1,8 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 
 from ngsTools import io
@@ -101,6 +106,89 @@ class TesGenomReader(unittest.TestCase):
         invertRead = io.SamAlignedRead.from_line("alpha\t16\tchrI\t11\t255\t*\t*\t0\t0\tTGCGA\tGGGGG")
         assert genom[invertRead.chromosome, invertRead.super(1, 1)] == "ATCGCAT"
 
+    def test_genom_block_cache(self):
+        genom = io.read("tests/test_data/genom.fasta", block_size=4, cache_size=3)
+
+        assert genom["chrI",2:11] == "CGTGCGTAT"
+        assert genom.cache_info() == (0, 3, 3, 3)
+        assert genom["chrI",4:8] == "TGCG"
+        assert genom.cache_info() == (1, 3, 3, 3)
+        assert genom["chrI",30:40] == "GTAGT"
+        assert genom.cache_info() == (1, 5, 3, 3)
+        assert genom["chrI"] == "ATCGTGCGTATGCGATGTACTGCGAGGCATGTAGT"
+        assert genom["chrII",24:27] == "GTA"
+
+    def test_genom_without_cache(self):
+        genom = io.read("tests/test_data/genom.fasta", cache_size=0)
+
+        assert genom["chrI",18:27] == "ACTGCGAGG"
+        assert genom["chrI",30:40] == "GTAGT"
+        assert genom["chrI",20:60] == "TGCGAGGCATGTAGT"
+        assert genom.cache_info() == (0, 0, 0, 0)
+
+    def test_genom_invalid_slices(self):
+        for cache_size in [64, 0]:
+            genom = io.read("tests/test_data/genom.fasta", cache_size=cache_size)
+
+            with self.assertRaises(TypeError):
+                genom["chrI",-3:5]
+            with self.assertRaises(TypeError):
+                genom["chrI",-1]
+            with self.assertRaises(TypeError):
+                genom["chrI",10:5]
+
+            assert genom["chrI",5:5] == ""
+
+    def test_genom_slices_are_clipped(self):
+        genom = io.read("tests/test_data/genom.fasta")
+
+        assert genom["chrI",20:60] == "TGCGAGGCATGTAGT"
+        assert genom["chrII",30:1000] == "AGCT"
+        assert genom["chrI",20:60:-1] == "ACTACATGCCTCGCA"
+
+    def test_genom_afetch(self):
+        genom = io.read("tests/test_data/genom.fasta")
+
+        async def fetch():
+            return await asyncio.gather(genom.afetch("chrI", 0, 10), genom.afetch("chrI", 18, 27),
+                                        genom.afetch("chrI", 30, 40), genom.afetch("chrI", 10, 15, True),
+                                        genom.afetch("chrII", 24, 27))
+
+        try:
+            assert asyncio.run(fetch()) == ["ATCGTGCGTA", "ACTGCGAGG", "GTAGT", "TCGCA", "GTA"]
+            assert genom._server.batches == 2
+            assert genom._server.preads == 2
+        finally:
+            genom.close()
+
+    def test_genom_afetch_invalid_regions(self):
+        genom = io.read("tests/test_data/genom.fasta")
+
+        try:
+            with self.assertRaises(TypeError):
+                asyncio.run(genom.afetch("chrI", -3, 5))
+            with self.assertRaises(TypeError):
+                asyncio.run(genom.afetch("chrI", 10, 5))
+            with self.assertRaises(TypeError):
+                genom._byte_range("chrI", -3, 5)
+        finally:
+            genom.close()
+
+    def test_genom_afetch_max_span(self):
+        genom = io.read("tests/test_data/genom.fasta")
+        server = io.GenomRegionServer(genom, max_gap=0, max_span=10)
+
+        async def fetch():
+            return await asyncio.gather(server.fetch("chrI", 0, 5), server.fetch("chrI", 5, 10),
+                                        server.fetch("chrI", 10, 20), server.fetch("chrI", 8, 12))
+
+        with server:
+            assert asyncio.run(fetch()) == ["ATCGT", "GCGTA", "TGCGATGTAC", "TATG"]
+            assert server.batches == 1
+            assert server.preads == 3
+            assert server._group([(0, 5), (5, 10), (10, 20), (8, 12)]) == [[0, 1], [3], [2]]
+            assert server._group([(0, 5), (5, 10), (10, 20)]) == [[0, 1], [2]]
+
 class TestGenomFeatureReader(unittest.TestCase):
     def test_opening(self):
         features = io.read("tests/test_data/features.gff")
@@ -145,5 +233,148 @@ class TestBedtoolsIntersectionReader(unittest.TestCase):
         assert genom[items[0]] == "TGCGT"
         assert genom[items[1]] == "CTGATC"
 
+    def test_columns(self):
+        intersection = io.BedtoolsIntersectionReader.open("tests/test_data/intersect.tab")
+
+        chunks = list(intersection.columns(chunk_size=1))
+        assert len(chunks) == 2
+        assert list(chunks[1].starts) == [4]
+        assert list(chunks[1].lengths) == [6]
+        assert list(chunks[1].strands) == [1]
+        assert intersection.chromosomes == ["chrI", "chrII"]
+        assert intersection.feature_ids == ["chrI", "chrII"]
+
+        chunk = next(intersection.columns())
+        assert len(chunk) == 2
+        assert list(chunk.feature_id_codes) == [0, 1]
+        assert chunk.count_by_chromosome() == {"chrI": 1, "chrII": 1}
+        assert chunk.bases_by_feature() == {"chrI": 5, "chrII": 6}
+        assert intersection.count_by_feature(chunk_size=1) == {"chrI": 1, "chrII": 1}
+
+    def test_columns_codes_in_file_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "intersect.tab")
+            with open(filename, "w") as fh:
+                for chromosome, fid in [("c3", "fC"), ("c1", "fA"), ("c3", "fB"), ("c2", "fA"), ("c1", "fD")]:
+                    fh.write("{0}\t4\t9\tread\t+\tgene\t1\t35\t{1}\n".format(chromosome, fid))
+
+            script = ("from ngsTools import io; reader = io.BedtoolsIntersectionReader.open({0!r}); "
+                      "chunk = next(reader.columns()); "
+                      "print(reader.chromosomes, reader.feature_ids, list(chunk.feature_id_codes))").format(filename)
+            outputs = set()
+            for seed in ["1", "2", "3", "4"]:
+                outputs.add(subprocess.check_output([sys.executable, "-c", script],
+                                                    env=dict(os.environ, PYTHONHASHSEED=seed)).decode().strip())
+
+            assert outputs == {"['c3', 'c1', 'c2'] ['fC', 'fA', 'fB', 'fD'] [0, 1, 2, 1, 3]"}
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_loads_no_readers(self):
+        modules = subprocess.check_output([sys.executable, "-c",
+            "import sys, ngsTools.io; print(sorted(m for m in sys.modules if m.startswith('ngsTools')))"])
+
+        assert modules.decode().strip() == "['ngsTools', 'ngsTools.io']"
+
+    def test_public_names(self):
+        assert io.SamReader.__name__ == "SamReader"
+        assert io.GenomReader.__name__ == "GenomReader"
+        assert "SamAlignedRead" in dir(io)
+
+        with self.assertRaises(AttributeError):
+            io.NoSuchReader
+
+    def test_submodule_imports_keep_classes(self):
+        script = ("from ngsTools.io.GenomReader import GenomReader; import ngsTools.io.BaseAlignedRead; "
+                  "from ngsTools import io; "
+                  "print([getattr(io, name).__class__.__name__ for name in "
+                  "['SamReader', 'GenomReader', 'ReaderProfiler', 'BaseAlignedRead']])")
+        output = subprocess.check_output([sys.executable, "-c", script])
+
+        assert output.decode().strip() == "['type', 'type', 'type', 'type']"
+
+    def test_afetch_keeps_region_server_class(self):
+        genom = io.read("tests/test_data/genom.fasta")
+        try:
+            assert asyncio.run(genom.afetch("chrI", 0, 5)) == "ATCGT"
+        finally:
+            genom.close()
+
+        assert isinstance(io.GenomRegionServer, type)
+        assert io.GenomRegionServer.__name__ == "GenomRegionServer"
+
+    def test_unknown_options(self):
+        for filename in ["tests/test_data/test.sam", "tests/test_data/genom.fasta", "tests/test_data/features.gff"]:
+            with self.assertRaisesRegex(TypeError, "does not support the options anything"):
+                io.read(filename, anything=1)
+
+    def test_register_reader(self):
+        try:
+            io.register_reader("tab", "ngsTools.io.BedtoolsIntersectionReader:BedtoolsIntersectionReader")
+            assert type(io.read("tests/test_data/intersect.tab")) == io.BedtoolsIntersectionReader
+
+            io.register_reader("tab", lambda filename: filename)
+            assert io.read("tests/test_data/intersect.tab") == "tests/test_data/intersect.tab"
+        finally:
+            del io._extension_to_reader["tab"]
+
+class TestReaderProfiler(unittest.TestCase):
+    def test_inactive_profiler(self):
+        reader = io.read("tests/test_data/test.sam")
+
+        assert io.ReaderProfiler.statistics_for(reader) is None
+
+    def test_sam_statistics(self):
+        reader = io.read("tests/test_data/test.sam")
+
+        with io.ReaderProfiler() as profiler:
+            count = len(list(reader))
+
+        statistics = profiler[reader]
+        assert len(profiler) == 1
+        assert statistics.records == count
+        assert statistics.opens == 1
+        assert statistics.lines > count
+        assert statistics.bytes == os.path.getsize("tests/test_data/test.sam")
+
+    def test_bytes_of_non_ascii_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "features.gff")
+            with open(filename, "w", encoding="utf-8") as fh:
+                fh.write("chrI\tassembly\tgene\t1\t35\t.\t+\t.\tID=GEN003A;Note=Müller\n")
+
+            features = io.read(filename)
+            with io.ReaderProfiler() as profiler:
+                assert len(list(features)) == 1
+
+            assert profiler[features].bytes == os.path.getsize(filename)
+
+    def test_bytes_of_mixed_line_endings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "mixed.sam")
+            with open(filename, "wb") as fh:
+                fh.write(b"r1\t0\tchrI\t1\t255\t5M\t*\t0\t0\tATCGT\tGGGGG\r\n")
+                fh.write(b"r2\t0\tchrI\t11\t255\t5M\t*\t0\t0\tTGCGA\tGGGGG\n")
+                fh.write(b"r3\t0\tchrI\t21\t255\t5M\t*\t0\t0\tTGCGA\tGGGGG\r\n")
+
+            reads = io.read(filename)
+            unprofiled = [read.qualityString for read in reads]
+            with io.ReaderProfiler() as profiler:
+                assert [read.qualityString for read in reads] == unprofiled == ["GGGGG"] * 3
+
+            assert profiler[reads].lines == 3
+            assert profiler[reads].bytes == os.path.getsize(filename)
+
+    def test_genom_seeks_and_callbacks(self):
+        profiled = []
+
+        with io.ReaderProfiler(callbacks=[profiled.append]) as profiler:
+            genom = io.read("tests/test_data/genom.fasta")
+            assert genom["chrI",0:20] == "ATCGTGCGTATGCGATGTAC"
+
+        statistics = profiler[genom]
+        assert profiled == [profiler]
+        assert statistics.opens == 2
+        assert statistics.seeks == 1
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import operator
+import os
+import tempfile
+import unittest
+
+from ngsTools import io
+from ngsTools.parallel import Shard, ShardScheduler
+
+
+def count_shard(shard, reads, features, reference):
+    return {shard.chromosome: (sum(1 for read in reads), len(features))}
+
+
+def merge_counts(left, right):
+    merged = dict(left)
+    for chromosome, (reads, features) in right.items():
+        old_reads, old_features = merged.get(chromosome, (0, 0))
+        merged[chromosome] = (old_reads + reads, old_features + features)
+    return merged
+
+
+def match_reference(shard, reads, features, reference):
+    return sum(1 for read in reads if reference[read] == read.sequence)
+
+
+class TestSamReaderIndex(unittest.TestCase):
+    def test_index(self):
+        reads = io.read("tests/test_data/genom.sam")
+        index = reads.index()
+
+        assert reads.indexed
+        assert len(index["chrI"]) == 2
+        assert len(index["chrII"]) == 1
+        assert [read.queryName for read in reads.fetch("chrI")] == ["r1", "r2", "r5"]
+        assert [read.queryName for read in reads.fetch("chrI", 5, 21)] == ["r2", "r5"]
+
+    def test_fetch_without_index(self):
+        reads = io.read("tests/test_data/genom.sam")
+
+        assert not reads.indexed
+        assert [read.queryName for read in reads.fetch("chrI", 5, 21)] == ["r2", "r5"]
+        assert [read.queryName for read in reads.fetch("chrII")] == ["r3"]
+
+
+    def test_sorted_index_checkpoints(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "sorted.sam")
+            with open(filename, "w") as fh:
+                fh.write("@HD\tVN:1.0\tSO:coordinate\n")
+                for position in range(1, 101):
+                    fh.write("r{0}\t0\tchrI\t{0}\t255\t5M\t*\t0\t0\tACGTA\tGGGGG\n".format(position))
+
+            unindexed = io.read(filename)
+            reads = io.read(filename)
+            index = reads.index(checkpoint_interval=10)
+
+            assert index["chrI"][0].positions == list(range(0, 100, 10))
+            for start, stop in [(0, 10), (42, 58), (95, 200), (3, 4)]:
+                assert [read.queryName for read in reads.fetch("chrI", start, stop)] == \
+                       [read.queryName for read in unindexed.fetch("chrI", start, stop)]
+
+            with io.ReaderProfiler() as profiler:
+                assert len(list(reads.fetch("chrI", 42, 58))) == 20
+
+            assert profiler[reads].lines <= 30
+            assert reads.indexed_size("chrI", 40, 60) == 20 * len("r40\t0\tchrI\t40\t255\t5M\t*\t0\t0\tACGTA\tGGGGG\n")
+
+    def test_unsorted_read_between_checkpoints(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "unsorted.sam")
+            with open(filename, "w") as fh:
+                for name, position in [("r1", 100), ("r2", 500), ("r3", 200)]:
+                    fh.write("{0}\t0\tchrI\t{1}\t255\t5M\t*\t0\t0\tACGTA\tGGGGG\n".format(name, position))
+
+            unindexed = io.read(filename)
+            reads = io.read(filename)
+            index = reads.index()
+
+            assert index["chrI"][0].positions is None
+            for start, stop in [(0, 300), (150, 250), (0, 1000)]:
+                assert [read.queryName for read in reads.fetch("chrI", start, stop)] == \
+                       [read.queryName for read in unindexed.fetch("chrI", start, stop)]
+            assert [read.queryName for read in reads.fetch("chrI", 0, 300)] == ["r1", "r3"]
+
+    def test_feature_fetch_reads_file_once(self):
+        features = io.read("tests/test_data/features.gff")
+
+        with io.ReaderProfiler() as profiler:
+            assert [feature.get_attribute("ID") for feature in features.fetch("chrI", 10, 12)] == ["chrI", "GEN001A"]
+            assert [feature.get_attribute("ID") for feature in features.fetch("chrII")] == ["chrII", "GEN002A"]
+
+        assert profiler[features].opens == 1
+
+
+class TestShardScheduler(unittest.TestCase):
+    def test_chromosome_shards(self):
+        genom = io.read("tests/test_data/genom.fasta")
+        scheduler = ShardScheduler(genom)
+
+        assert scheduler.shards() == [Shard("chrI", 0, 35, 35), Shard("chrII", 0, 34, 34)]
+
+    def test_region_shards(self):
+        genom = io.read("tests/test_data/genom.fasta")
+        scheduler = ShardScheduler(genom, region_size=20)
+
+        assert [(shard.chromosome, shard.start, shard.stop) for shard in scheduler.shards()] == [
+            ("chrI", 0, 20), ("chrI", 20, 35), ("chrII", 0, 20), ("chrII", 20, 34)]
+
+    def test_run_in_process(self):
+        scheduler = ShardScheduler(io.read("tests/test_data/genom.fasta"), reads=io.read("tests/test_data/genom.sam"),
+                                   features=io.read("tests/test_data/features.gff"), processes=1)
+
+        assert scheduler.run(count_shard, combine=merge_counts) == {"chrI": (3, 2), "chrII": (1, 2)}
+
+    def test_run_in_pool(self):
+        scheduler = ShardScheduler(io.read("tests/test_data/genom.fasta"), reads=io.read("tests/test_data/genom.sam"),
+                                   processes=2)
+
+        results = scheduler.run(match_reference)
+        assert [shard.chromosome for shard in results] == ["chrI", "chrII"]
+        assert scheduler.run(match_reference, combine=operator.add) == 4
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from ngsTools import io
+from ngsTools.qc import QualityStatistics
+
+
+class TestQualityStatistics(unittest.TestCase):
+    def test_read_qualities(self):
+        read = io.SamAlignedRead.from_line("r4\t4\t*\t0\t0\t*\t*\t0\t0\tACGTN\tBB<<#\n")
+
+        assert read.qualityString == "BB<<#"
+        assert list(read.qualities) == [33, 33, 27, 27, 2]
+        assert read.storedSequence == "ACGTN"
+
+        read = io.SamAlignedRead.from_line("r6\t16\tchrI\t1\t255\t*\t*\t0\t0\tacgtt\t*\n")
+        assert read.storedSequence == "ACGTT"
+        assert read.sequence == "AACGT"
+        assert read.qualityString is None
+
+    def test_collect(self):
+        statistics = QualityStatistics.collect(io.read("tests/test_data/genom.sam"), chunk_size=2)
+
+        assert statistics.reads == 5
+        assert statistics.bases == 28
+        assert len(statistics.per_cycle) == 10
+        assert statistics.per_cycle_mean()[0] == 37.0
+        assert statistics.per_cycle_mean()[4] == 29.0
+        assert statistics.per_cycle_quantile(0.5)[4] == 38
+        assert statistics.per_cycle_quantile(0)[4] == 2
+        assert statistics.gc_content == 0.5
+        assert statistics.n_rate == 1 / 28
+        assert statistics.mapq_histogram == {255: 4, 0: 1}
+        assert statistics.flag_histogram == {0: 3, 16: 1, 4: 1}
+
+    def test_merge(self):
+        reads = list(io.read("tests/test_data/genom.sam"))
+        whole = QualityStatistics.collect(reads)
+        merged = QualityStatistics.collect(reads[:3]) + QualityStatistics.collect(reads[3:])
+
+        assert merged.reads == whole.reads
+        assert merged.per_cycle == whole.per_cycle
+        assert merged.base_counts == whole.base_counts
+        assert merged.gc_histogram == whole.gc_histogram
+        assert merged.flag_histogram == whole.flag_histogram
+
+if __name__ == '__main__':
+    unittest.main()